@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+
+from utils.manifest import sync_dataset
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Copy only new or changed files of a speaker dataset to another directory."
+    )
+    parser.add_argument("source", help="Speaker dataset directory (e.g. SPEAKERNAME/)")
+    parser.add_argument("destination", help="Destination directory on training storage")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of parallel hashing/copy threads")
+    args = parser.parse_args()
+
+    try:
+        copied = sync_dataset(args.source, args.destination, max_workers=args.jobs)
+    except (ValueError, OSError) as e:
+        print(f"Sync failed: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    for rel_path in copied:
+        print(rel_path)
+    print(f"Copied {len(copied)} file(s).")
\ No newline at end of file
@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import manifest
+from utils.manifest import build_manifest, update_manifest, diff_manifests, sync_dataset
+
+
+class ManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_dir = os.path.join(self.tmp_dir, "SPEAKER")
+        self.dst_dir = os.path.join(self.tmp_dir, "dst")
+        os.makedirs(os.path.join(self.src_dir, "wavs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, rel_path, data, base_dir=None):
+        path = os.path.join(base_dir or self.src_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def hashed_paths(self, dataset_dir):
+        """Rebuild the manifest and return the paths that were hashed."""
+        with mock.patch.object(manifest, 'hash_file', wraps=manifest.hash_file) as hash_file:
+            build_manifest(dataset_dir)
+        return sorted(os.path.relpath(call.args[0], dataset_dir).replace(os.sep, '/')
+                      for call in hash_file.call_args_list)
+
+
+class TestHashCache(ManifestTestCase):
+    def test_unchanged_file_is_not_rehashed(self):
+        self.write("wavs/a.wav", b"aaaa")
+        self.assertEqual(self.hashed_paths(self.src_dir), ["wavs/a.wav"])
+        self.assertEqual(self.hashed_paths(self.src_dir), [])
+
+    def test_changed_size_is_rehashed(self):
+        path = self.write("wavs/a.wav", b"aaaa")
+        build_manifest(self.src_dir)
+        st = os.stat(path)
+        self.write("wavs/a.wav", b"aaaaaa")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(self.hashed_paths(self.src_dir), ["wavs/a.wav"])
+
+    def test_changed_mtime_is_rehashed(self):
+        path = self.write("wavs/a.wav", b"aaaa")
+        build_manifest(self.src_dir)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        self.assertEqual(self.hashed_paths(self.src_dir), ["wavs/a.wav"])
+
+    def test_corrupt_manifest_is_rebuilt(self):
+        self.write("wavs/a.wav", b"aaaa")
+        self.write(manifest.MANIFEST_FILENAME, b'{"files": {')
+        self.assertIn("wavs/a.wav", build_manifest(self.src_dir)['files'])
+
+    def test_malformed_entry_is_rehashed(self):
+        self.write("wavs/a.wav", b"aaaa")
+        self.write(manifest.MANIFEST_FILENAME, b'{"files": {"wavs/a.wav": 1}}')
+        self.assertEqual(self.hashed_paths(self.src_dir), ["wavs/a.wav"])
+
+
+class TestUpdateManifest(ManifestTestCase):
+    def test_rewritten_file_is_rehashed_with_metadata(self):
+        path = self.write("wavs/SPEAKER_001.wav", b"aaaa")
+        build_manifest(self.src_dir)
+        st = os.stat(path)
+        self.write("wavs/SPEAKER_001.wav", b"bbbb")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+        utterance = {'sentence_id': "001", 'text': "hello"}
+        update_manifest(self.src_dir, ["wavs/SPEAKER_001.wav"],
+                        {"wavs/SPEAKER_001.wav": utterance})
+
+        entry = manifest.load_manifest(self.src_dir)['files']["wavs/SPEAKER_001.wav"]
+        self.assertEqual(entry['sha256'], manifest.hash_file(path))
+        self.assertEqual(entry['sentence_id'], "001")
+        self.assertEqual(entry['text'], "hello")
+
+
+class TestFillMetadata(ManifestTestCase):
+    def test_metadata_is_backfilled(self):
+        self.write("wavs/SPEAKER_001.wav", b"aaaa")
+        self.write("wavs/SPEAKER_002.wav", b"bbbb")
+        self.write("txt/SPEAKER_001.txt", b"hello")
+        self.write("metadata.csv", b"audio_file|text\nSPEAKER_002.wav|bye\n")
+        files = build_manifest(self.src_dir)['files']
+        self.assertEqual(files["wavs/SPEAKER_001.wav"]['text'], "hello")
+        self.assertEqual(files["wavs/SPEAKER_001.wav"]['sentence_id'], "001")
+        self.assertEqual(files["wavs/SPEAKER_002.wav"]['text'], "bye")
+
+
+class TestDiffManifests(ManifestTestCase):
+    def test_reports_new_and_changed_files(self):
+        src = {'files': {
+            "wavs/same.wav": {'sha256': "1"},
+            "wavs/changed.wav": {'sha256': "2"},
+            "wavs/new.wav": {'sha256': "3"},
+        }}
+        dst = {'files': {
+            "wavs/same.wav": {'sha256': "1"},
+            "wavs/changed.wav": {'sha256': "x"},
+            "wavs/extra.wav": {'sha256': "4"},
+        }}
+        self.assertEqual(diff_manifests(src, dst), ["wavs/changed.wav", "wavs/new.wav"])
+
+
+class TestSyncDataset(ManifestTestCase):
+    def test_second_sync_copies_nothing(self):
+        self.write("wavs/a.wav", b"aaaa")
+        self.write("metadata.csv", b"audio_file|text\n")
+        self.assertEqual(sync_dataset(self.src_dir, self.dst_dir), ["metadata.csv", "wavs/a.wav"])
+        self.assertEqual(sync_dataset(self.src_dir, self.dst_dir), [])
+
+        self.write("wavs/b.wav", b"bbbb")
+        self.assertEqual(sync_dataset(self.src_dir, self.dst_dir), ["wavs/b.wav"])
+        with open(os.path.join(self.dst_dir, "wavs", "b.wav"), 'rb') as f:
+            self.assertEqual(f.read(), b"bbbb")
+
+    def test_hash_mismatch_raises_and_drops_entry(self):
+        self.write("wavs/a.wav", b"aaaa")
+        real_copy = manifest._copy_file
+
+        def corrupt_copy(src_path, dst_path, chunk_size=manifest.CHUNK_SIZE):
+            real_copy(src_path, dst_path, chunk_size)
+            self.write("wavs/a.wav", b"corrupt", self.dst_dir)
+            return manifest.hash_file(dst_path)
+
+        with mock.patch.object(manifest, '_copy_file', corrupt_copy):
+            with self.assertRaises(IOError):
+                sync_dataset(self.src_dir, self.dst_dir)
+
+        self.assertNotIn("wavs/a.wav", manifest.load_manifest(self.dst_dir)['files'])
+
+    def test_failed_copy_removes_partial_file(self):
+        self.write("wavs/a.wav", b"aaaa")
+        with mock.patch.object(manifest.shutil, 'copystat', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                sync_dataset(self.src_dir, self.dst_dir)
+        self.assertFalse(os.path.exists(os.path.join(self.dst_dir, "wavs", "a.wav" + manifest.COPY_SUFFIX)))
+
+    def test_destination_inside_source_is_rejected(self):
+        self.write("wavs/a.wav", b"aaaa")
+        with self.assertRaises(ValueError):
+            sync_dataset(self.src_dir, os.path.join(self.src_dir, "out"))
+        with self.assertRaises(ValueError):
+            sync_dataset(self.src_dir, self.src_dir)
+
+    def test_only_internal_files_are_skipped(self):
+        self.write("wavs/a.part", b"aaaa")
+        self.write("nested/" + manifest.MANIFEST_FILENAME, b"{}")
+        self.assertEqual(sync_dataset(self.src_dir, self.dst_dir), ["wavs/a.part"])
+
+
+if __name__ == '__main__':
+    unittest.main()
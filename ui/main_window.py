@@ -13,6 +13,7 @@ from PyQt6.QtGui import QFont, QShortcut, QKeySequence, QIcon
 
 from audio.recorder import AudioRecorder
 from utils.audio_utils import get_input_devices
+from utils.manifest import update_manifest
 
 class TTSDatasetCreator(QMainWindow):
     def __init__(self):
@@ -390,6 +391,19 @@ class TTSDatasetCreator(QMainWindow):
             
             self.done_sentences.add(current['id'])
             
+            # Update manifest for the files written above
+            utterance = {'sentence_id': current['id'], 'text': current['text']}
+            wav_path = f"wavs/{audio_filename}"
+            txt_path = f"txt/{txt_filename}"
+            try:
+                update_manifest(
+                    self.output_dir,
+                    [wav_path, txt_path, "metadata.csv", os.path.basename(self.done_sentences_file)],
+                    {wav_path: utterance, txt_path: utterance}
+                )
+            except Exception as e:
+                QMessageBox.warning(self, "Warning", f"Failed to update manifest: {str(e)}")
+            
             # Move to next sentence
             self.current_sentence_index += 1
             self.load_next_sentence()
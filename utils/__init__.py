@@ -1,4 +1,12 @@
 # This file makes the utils directory a Python package
-from .audio_utils import get_input_devices
+from .manifest import build_manifest, update_manifest, sync_dataset
 
-__all__ = ['get_input_devices']
\ No newline at end of file
+__all__ = ['get_input_devices', 'build_manifest', 'update_manifest', 'sync_dataset']
+
+
+def __getattr__(name):
+    # Import audio_utils lazily so the manifest tools work without PyAudio
+    if name == 'get_input_devices':
+        from .audio_utils import get_input_devices
+        return get_input_devices
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,374 @@
+import os
+import csv
+import json
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+COPY_SUFFIX = ".sync-part"  # Temporary files written by sync_dataset
+CHUNK_SIZE = 1024 * 1024  # 1 MiB reads/writes for hashing and copying
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Compute the SHA-256 hash of a file using chunked reads.
+
+    Args:
+        path (str): Path to the file
+        chunk_size (int): Number of bytes to read at a time
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(dataset_dir):
+    """
+    Load the manifest of a dataset directory.
+
+    Args:
+        dataset_dir (str): Speaker dataset directory
+
+    Returns:
+        dict: The manifest, or an empty manifest if none exists yet
+            or the existing one cannot be parsed
+    """
+    path = os.path.join(dataset_dir, MANIFEST_FILENAME)
+    empty = {'version': MANIFEST_VERSION, 'files': {}}
+    if not os.path.exists(path):
+        return empty
+
+    # The manifest is only a cache, so an unreadable one is rebuilt from scratch
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except ValueError:
+        return empty
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('files', {}), dict):
+        return empty
+
+    # Drop malformed entries so they are re-hashed rather than breaking the scan
+    manifest['files'] = {rel_path: entry
+                         for rel_path, entry in manifest.get('files', {}).items()
+                         if isinstance(entry, dict)}
+    return manifest
+
+
+def save_manifest(dataset_dir, manifest):
+    """
+    Atomically write the manifest of a dataset directory.
+
+    Args:
+        dataset_dir (str): Speaker dataset directory
+        manifest (dict): The manifest to write
+    """
+    path = os.path.join(dataset_dir, MANIFEST_FILENAME)
+    manifest['version'] = MANIFEST_VERSION
+
+    # Unique temp file so concurrent writers (GUI and sync) never share one
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=dataset_dir,
+                                     prefix=MANIFEST_FILENAME + '.', suffix='.tmp',
+                                     delete=False) as f:
+        tmp_path = f.name
+        try:
+            json.dump(manifest, f, indent=1, ensure_ascii=False, sort_keys=True)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _stat_entry(dataset_dir, rel_path):
+    """Return the size and mtime of a file inside the dataset directory."""
+    st = os.stat(os.path.join(dataset_dir, rel_path))
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _is_cached(entry, stat):
+    """Check whether a manifest entry still matches the file on disk."""
+    return (entry is not None and 'sha256' in entry
+            and entry.get('size') == stat['size']
+            and entry.get('mtime_ns') == stat['mtime_ns'])
+
+
+def _hash_entries(dataset_dir, files, rel_paths, max_workers=None):
+    """Hash the given files in parallel, reusing cached hashes where possible."""
+    to_hash = []
+    for rel_path in rel_paths:
+        stat = _stat_entry(dataset_dir, rel_path)
+        entry = files.get(rel_path)
+        if _is_cached(entry, stat):
+            continue
+        # Keep utterance metadata, drop the stale hash
+        entry = dict(entry or {})
+        entry.update(stat)
+        entry.pop('sha256', None)
+        files[rel_path] = entry
+        to_hash.append(rel_path)
+
+    if not to_hash:
+        return
+
+    paths = [os.path.join(dataset_dir, rel_path) for rel_path in to_hash]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for rel_path, digest in zip(to_hash, executor.map(hash_file, paths)):
+            files[rel_path]['sha256'] = digest
+
+
+def _is_internal_file(name):
+    """Check whether a filename is a manifest or a temp file written by this module."""
+    if name == MANIFEST_FILENAME:
+        return True
+    if name.startswith(MANIFEST_FILENAME + '.') and name.endswith('.tmp'):
+        return True
+    return name.endswith(COPY_SUFFIX)
+
+
+def _walk_files(dataset_dir):
+    """Yield dataset-relative paths of all files, excluding manifests and temp files."""
+    for root, _, filenames in os.walk(dataset_dir):
+        for name in filenames:
+            if _is_internal_file(name):
+                continue
+            rel_path = os.path.relpath(os.path.join(root, name), dataset_dir)
+            yield rel_path.replace(os.sep, '/')
+
+
+def _speaker_name(dataset_dir, rel_paths):
+    """Infer the speaker name from the DONE_SENTENCES file or the directory name."""
+    suffix = "_DONE_SENTENCES.txt"
+    for rel_path in rel_paths:
+        if '/' not in rel_path and rel_path.endswith(suffix):
+            return rel_path[:-len(suffix)]
+    return os.path.basename(os.path.normpath(dataset_dir))
+
+
+def _load_metadata_texts(dataset_dir):
+    """Read metadata.csv into a mapping of audio filename to text."""
+    path = os.path.join(dataset_dir, "metadata.csv")
+    texts = {}
+    if not os.path.exists(path):
+        return texts
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='|')
+        next(reader, None)  # Skip header
+        for row in reader:
+            if len(row) >= 2:
+                texts[row[0]] = row[1]
+    return texts
+
+
+def _fill_metadata(dataset_dir, files):
+    """
+    Backfill sentence_id and text for WAV and text entries that lack them.
+
+    Text comes from the matching txt/ file, falling back to metadata.csv.
+    This covers recordings made before the manifest existed.
+    """
+    missing = [rel_path for rel_path, entry in files.items()
+               if 'text' not in entry
+               and (rel_path.startswith('wavs/') and rel_path.endswith('.wav')
+                    or rel_path.startswith('txt/') and rel_path.endswith('.txt'))]
+    if not missing:
+        return
+
+    prefix = _speaker_name(dataset_dir, files) + "_"
+    metadata_texts = None
+
+    for rel_path in missing:
+        stem = os.path.splitext(rel_path.split('/', 1)[1])[0]
+        txt_path = os.path.join(dataset_dir, "txt", stem + ".txt")
+
+        text = None
+        if os.path.exists(txt_path):
+            with open(txt_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            if metadata_texts is None:
+                metadata_texts = _load_metadata_texts(dataset_dir)
+            text = metadata_texts.get(stem + ".wav")
+        if text is None:
+            continue
+
+        entry = files[rel_path]
+        entry['text'] = text
+        if stem.startswith(prefix):
+            entry['sentence_id'] = stem[len(prefix):]
+
+
+def build_manifest(dataset_dir, max_workers=None, save=True):
+    """
+    Scan a dataset directory and bring its manifest up to date.
+
+    Files whose size and mtime match the existing manifest keep their
+    cached hash; everything else is hashed in parallel. Entries for
+    files that no longer exist are removed. WAV and text entries without
+    utterance metadata get it filled in from txt/ or metadata.csv.
+
+    Args:
+        dataset_dir (str): Speaker dataset directory
+        max_workers (int): Number of hashing threads (None for default)
+        save (bool): Whether to write the refreshed manifest to disk
+
+    Returns:
+        dict: The refreshed manifest
+    """
+    manifest = load_manifest(dataset_dir)
+    files = manifest['files']
+
+    rel_paths = list(_walk_files(dataset_dir))
+    present = set(rel_paths)
+    for rel_path in list(files):
+        if rel_path not in present:
+            del files[rel_path]
+
+    _hash_entries(dataset_dir, files, rel_paths, max_workers)
+    _fill_metadata(dataset_dir, files)
+
+    if save:
+        save_manifest(dataset_dir, manifest)
+    return manifest
+
+
+def update_manifest(dataset_dir, rel_paths, metadata=None):
+    """
+    Incrementally add or refresh entries in a dataset manifest.
+
+    Args:
+        dataset_dir (str): Speaker dataset directory
+        rel_paths (list): Dataset-relative paths of files that were written
+        metadata (dict): Optional mapping of path to utterance metadata
+            (e.g. sentence_id and text) to attach to that entry
+
+    Returns:
+        dict: The updated manifest
+    """
+    manifest = load_manifest(dataset_dir)
+    files = manifest['files']
+
+    for rel_path in rel_paths:
+        entry = dict(files.get(rel_path, {}))
+        entry.pop('sha256', None)
+        if metadata and rel_path in metadata:
+            entry.update(metadata[rel_path])
+        files[rel_path] = entry
+
+    _hash_entries(dataset_dir, files, rel_paths)
+    save_manifest(dataset_dir, manifest)
+    return manifest
+
+
+def diff_manifests(src_manifest, dst_manifest):
+    """
+    Find files that are new or changed in the source manifest.
+
+    Args:
+        src_manifest (dict): Manifest of the source dataset
+        dst_manifest (dict): Manifest of the destination dataset
+
+    Returns:
+        list: Sorted dataset-relative paths that need to be copied
+    """
+    dst_files = dst_manifest['files']
+    changed = []
+    for rel_path, entry in src_manifest['files'].items():
+        dst_entry = dst_files.get(rel_path)
+        if dst_entry is None or dst_entry.get('sha256') != entry['sha256']:
+            changed.append(rel_path)
+    return sorted(changed)
+
+
+def _copy_file(src_path, dst_path, chunk_size=CHUNK_SIZE):
+    """Copy a file with chunked I/O through a temporary file and return the destination hash."""
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    tmp_path = dst_path + COPY_SUFFIX
+    try:
+        with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, chunk_size)
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return hash_file(dst_path, chunk_size)
+
+
+def sync_dataset(src_dir, dst_dir, max_workers=None):
+    """
+    Copy only new or changed files from one dataset directory to another.
+
+    Both manifests are refreshed first (cheap for unchanged files thanks
+    to the size/mtime cache), then the differing files are copied in
+    parallel and their hashes verified against the source manifest.
+
+    Args:
+        src_dir (str): Source speaker dataset directory
+        dst_dir (str): Destination directory
+        max_workers (int): Number of hashing/copy threads (None for default)
+
+    Returns:
+        list: Dataset-relative paths that were copied
+
+    Raises:
+        ValueError: If the destination is the source or lies inside it
+        IOError: If a copied file does not match its source hash
+    """
+    src_real = os.path.realpath(src_dir)
+    dst_real = os.path.realpath(dst_dir)
+    if dst_real == src_real or dst_real.startswith(os.path.join(src_real, '')):
+        raise ValueError(f"Destination {dst_dir} must not be inside source {src_dir}")
+
+    os.makedirs(dst_dir, exist_ok=True)
+    src_manifest = build_manifest(src_dir, max_workers)
+    dst_manifest = build_manifest(dst_dir, max_workers, save=False)
+
+    changed = diff_manifests(src_manifest, dst_manifest)
+    changed_set = set(changed)
+
+    def copy_one(rel_path):
+        src_path = os.path.join(src_dir, *rel_path.split('/'))
+        dst_path = os.path.join(dst_dir, *rel_path.split('/'))
+        return _copy_file(src_path, dst_path)
+
+    dst_files = dst_manifest['files']
+
+    # Carry utterance metadata over for files that are already in sync
+    for rel_path, entry in src_manifest['files'].items():
+        if rel_path in dst_files and rel_path not in changed_set:
+            merged = dict(entry)
+            merged.update(_stat_entry(dst_dir, rel_path))
+            dst_files[rel_path] = merged
+
+    mismatched = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for rel_path, digest in zip(changed, executor.map(copy_one, changed)):
+                entry = dict(src_manifest['files'][rel_path])
+                if digest != entry['sha256']:
+                    mismatched.append(rel_path)
+                    dst_files.pop(rel_path, None)
+                    continue
+                entry.update(_stat_entry(dst_dir, rel_path))
+                dst_files[rel_path] = entry
+    finally:
+        save_manifest(dst_dir, dst_manifest)
+
+    if mismatched:
+        raise IOError(f"Hash mismatch after copying: {', '.join(mismatched)}")
+
+    return changed